@@ -0,0 +1,201 @@
+"""Shared audio helpers for the voice assistant scripts."""
+
+import threading
+import time
+from collections import deque
+from queue import Empty
+
+import numpy as np
+import sounddevice as sd
+import soundfile as sf
+
+PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to NumPy
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _scale_pcm16(src, dst):
+        # Serial on purpose: a phrase is ~100k samples, too few for prange
+        # thread startup to pay off
+        for i in range(src.shape[0]):
+            dst[i] = src[i] * PCM16_SCALE
+else:
+    _scale_pcm16 = None
+
+def pcm16_to_float32(raw, out=None):
+    """Convert raw 16-bit PCM bytes to float32 samples in [-1.0, 1.0).
+
+    Uses a Numba kernel when numba is installed, otherwise a single float32
+    NumPy multiply; neither makes an intermediate int16->float32 copy. Pass
+    ``out``, e.g. a buffer sized for one phrase and allocated once, so
+    transcribing a phrase doesn't allocate; the filled slice of it is
+    returned, or a new array if ``out`` is too small.
+    """
+    samples = np.frombuffer(raw, dtype=np.int16)
+    if out is None or len(out) < len(samples):
+        out = np.empty(len(samples), dtype=np.float32)
+    else:
+        out = out[:len(samples)]
+    
+    if _scale_pcm16 is not None:
+        _scale_pcm16(samples, out)
+    else:
+        np.multiply(samples, PCM16_SCALE, out=out)
+    return out
+
+class Sound:
+    """Notification sound decoded once, so playing it never touches the disk.
+
+    If the file cannot be read a warning is printed and ``play`` does
+    nothing.
+    """
+    def __init__(self, path):
+        try:
+            self.data, self.samplerate = sf.read(path, dtype="float32", always_2d=False)
+        except Exception as e:
+            print(f"Could not load sound {path}: {e}")
+            self.data, self.samplerate = None, None
+    
+    def play(self):
+        """Play the sound and block until it finishes."""
+        if self.data is None:
+            return
+        sd.play(self.data, self.samplerate)
+        sd.wait()
+
+class FrameAligner:
+    """Split a stream of raw PCM16 chunks into fixed-size int16 frames.
+
+    Samples that don't fill a whole frame are kept and completed by the next
+    chunk. That boundary frame is assembled in one reusable buffer, so the
+    stream is framed without per-chunk concatenation or zero padding.
+    """
+    def __init__(self, frame_size=1280):
+        self.frame_size = frame_size
+        self._frame = np.zeros(frame_size, dtype=np.int16)
+        self._fill = 0
+    
+    def frames(self, raw):
+        """Yield ``(frame, end)`` for each complete frame.
+
+        ``end`` is the sample offset in ``raw`` just past the frame. A frame
+        may be the shared boundary buffer, so consume it before advancing.
+        """
+        samples = np.frombuffer(raw, dtype=np.int16)
+        start = 0
+        
+        if self._fill:
+            start = min(self.frame_size - self._fill, len(samples))
+            self._frame[self._fill:self._fill + start] = samples[:start]
+            self._fill += start
+            if self._fill < self.frame_size:
+                return
+            self._fill = 0
+            yield self._frame, start
+        
+        n = start + (len(samples) - start) // self.frame_size * self.frame_size
+        for i in range(start, n, self.frame_size):
+            yield samples[i:i + self.frame_size], i + self.frame_size
+        
+        self._fill = len(samples) - n
+        self._frame[:self._fill] = samples[n:]
+
+class RingBuffer:
+    """Single-producer/single-consumer ring of int16 samples.
+
+    The writer only advances the write count and the reader only advances
+    the read count, so an audio callback can write without taking a lock.
+    A reader that falls a whole buffer behind skips ahead to the oldest
+    samples still held.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._buf = np.zeros(capacity, dtype=np.int16)
+        self._written = 0
+        self._read = 0
+    
+    def write(self, samples):
+        if len(samples) > self.capacity:
+            self._written += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+        
+        start = self._written % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._buf[start:start + first] = samples[:first]
+        self._buf[:len(samples) - first] = samples[first:]
+        self._written += len(samples)
+    
+    def read(self, n, out):
+        """Copy the next ``n`` samples into ``out``, or return None if fewer are buffered."""
+        if self._written - self._read > self.capacity:
+            self._read = self._written - self.capacity
+        if self._written - self._read < n:
+            return None
+        
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._buf[start:start + first]
+        out[first:n] = self._buf[:n - first]
+        self._read += n
+        return out[:n]
+
+class DropOldestQueue:
+    """Bounded single-producer/single-consumer queue that discards its oldest item.
+
+    Audio callbacks use ``put_latest`` so a consumer that falls behind
+    works on recent audio rather than an ever-growing backlog; with a
+    ``maxsize`` of a few phrases a slow transcription catches up on fresh
+    speech instead of answering what was said a minute ago. Built on a
+    ``deque(maxlen=...)`` and an Event rather than ``queue.Queue``, which
+    takes its locks on every put and get. Drops are counted by the producer
+    and reported from ``get``, at most once every ``report_interval``
+    seconds and always once the queue drains, so none go unreported.
+    """
+    def __init__(self, maxsize, name="Audio", report_interval=5.0):
+        self.maxsize = maxsize
+        self.name = name
+        self.report_interval = report_interval
+        self.dropped = 0
+        self._items = deque(maxlen=maxsize)
+        self._ready = threading.Event()
+        self._reported = 0
+        self._last_report = float("-inf")
+    
+    def put_latest(self, item):
+        if len(self._items) == self.maxsize:
+            self.dropped += 1
+        self._items.append(item)
+        self._ready.set()
+    
+    def get(self, timeout=None):
+        """Pop the oldest item, waiting up to ``timeout`` seconds.
+
+        Raises ``queue.Empty`` if nothing arrives in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                item = self._items.popleft()
+            except IndexError:
+                pass
+            else:
+                if self.dropped != self._reported:
+                    self._report(force=not self._items)
+                return item
+            
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise Empty
+            self._ready.wait(remaining)
+            self._ready.clear()
+    
+    def _report(self, force=False):
+        now = time.monotonic()
+        if force or now - self._last_report >= self.report_interval:
+            print(f"[{self.name}] Dropped {self.dropped - self._reported} stale chunk(s), processing is behind real time")
+            self._reported = self.dropped
+            self._last_report = now
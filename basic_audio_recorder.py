@@ -3,9 +3,8 @@
 
 import speech_recognition as sr
 import wave
-from queue import Queue
-from datetime import datetime
-from time import sleep
+from queue import Queue, Empty
+import time
 
 class AudioRecorder:
     def __init__(self, sample_rate=16000):
@@ -19,6 +18,22 @@ class AudioRecorder:
         self.audio_queue.put(audio.get_raw_data())
         
     def record(self, duration_seconds, chunk_size=1):
+        """Record from the microphone and return the audio as bytes."""
+        chunks = []
+        self._capture(duration_seconds, chunk_size, chunks.append)
+        return b"".join(chunks)
+    
+    def record_to_wav(self, filename, duration_seconds, chunk_size=1):
+        """Record from the microphone, writing each chunk to a WAV file as it arrives."""
+        # Open the output before the listener starts so a bad path can't
+        # leave the background thread running
+        with self._open_wav(filename) as wf:
+            total = self._capture(duration_seconds, chunk_size, wf.writeframes)
+        
+        print(f"\nSaved: {filename} ({total / (self.sample_rate * 2):.2f}s)")
+    
+    def _capture(self, duration_seconds, chunk_size, sink):
+        """Pass captured chunks to ``sink`` and return the number of bytes."""
         source = sr.Microphone(sample_rate=self.sample_rate)
         
         with source as src:
@@ -33,37 +48,47 @@ class AudioRecorder:
             phrase_time_limit=chunk_size
         )
         
-        all_audio = b''
-        start_time = datetime.now()
-        expected_bytes = self.sample_rate * 2 * duration_seconds
+        total = 0
+        bytes_per_sec = self.sample_rate * 2
+        expected_bytes = bytes_per_sec * duration_seconds
+        start = time.monotonic()
+        last_print = start
         
         try:
             while True:
-                elapsed = (datetime.now() - start_time).total_seconds()
-                
-                while not self.audio_queue.empty():
-                    all_audio += self.audio_queue.get()
-                    current = len(all_audio) / (self.sample_rate * 2)
-                    print(f"Captured: {current:.1f}s / {duration_seconds}s")
+                try:
+                    data = self.audio_queue.get(timeout=0.2)
+                    sink(data)
+                    total += len(data)
+                    
+                    now = time.monotonic()
+                    if now - last_print > 0.25:
+                        print(f"Captured: {total / bytes_per_sec:.1f}s / {duration_seconds}s")
+                        last_print = now
+                except Empty:
+                    pass
                 
-                if len(all_audio) >= expected_bytes:
+                if total >= expected_bytes:
                     break
                 
+                elapsed = time.monotonic() - start
                 if elapsed > duration_seconds + 3:
                     print(f"Warning: Timeout at {elapsed:.1f}s")
                     break
-                    
-                sleep(0.05)
         finally:
             stop_listening(wait_for_stop=False)
         
-        return all_audio
+        return total
+    
+    def _open_wav(self, filename):
+        wf = wave.open(filename, 'wb')
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(self.sample_rate)
+        return wf
     
     def save_wav(self, audio_data, filename):
-        with wave.open(filename, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(self.sample_rate)
+        with self._open_wav(filename) as wf:
             wf.writeframes(audio_data)
         
         duration = len(audio_data) / (self.sample_rate * 2)
@@ -71,5 +96,4 @@ class AudioRecorder:
 
 if __name__ == "__main__":
     recorder = AudioRecorder(sample_rate=16000)
-    audio = recorder.record(duration_seconds=5, chunk_size=1)
-    recorder.save_wav(audio, "recording.wav")
\ No newline at end of file
+    recorder.record_to_wav("recording.wav", duration_seconds=5, chunk_size=1)
\ No newline at end of file
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Simple text-based chat with Ollama."""
 
+import sys
+import time
 import ollama
 
 def chat():
@@ -35,13 +37,30 @@ def chat():
                     stream=True
                 )
                 
-                full_response = ""
-                for chunk in stream:
-                    content = chunk['message']['content']
-                    print(content, end="", flush=True)
-                    full_response += content
+                # Write tokens in batches: flush every ~30 ms or at the end of
+                # a line or sentence instead of once per token
+                parts = []
+                pending = []
+                last_flush = time.monotonic()
+                try:
+                    for chunk in stream:
+                        content = chunk['message']['content']
+                        parts.append(content)
+                        pending.append(content)
+                        
+                        now = time.monotonic()
+                        if now - last_flush > 0.03 or content.endswith(('\n', '.', '!', '?')):
+                            sys.stdout.write("".join(pending))
+                            sys.stdout.flush()
+                            pending.clear()
+                            last_flush = now
+                finally:
+                    # Show tokens already received even if the stream fails
+                    sys.stdout.write("".join(pending))
+                    sys.stdout.flush()
                 
                 print() # Newline after response
+                full_response = "".join(parts)
                 
                 # Add assistant response to history
                 messages.append({'role': 'assistant', 'content': full_response})
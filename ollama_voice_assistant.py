@@ -3,87 +3,124 @@
 
 import speech_recognition as sr
 import numpy as np
-import re
-import sounddevice as sd
-import soundfile as sf
-from queue import Queue
-from time import sleep
-from faster_whisper import WhisperModel
+import asyncio
+import threading
+from queue import Empty
+from whisper_pool import get_whisper
+from audio_utils import pcm16_to_float32, DropOldestQueue, Sound
+from wake_text import WakeMatcher
 import ollama
 
 class VoiceAssistant:
     def __init__(
         self,
         wake_pattern=r"\b(hey|hi|hello)\s+(assistant|jarvis)\b",
+        wake_prefixes=None,
         model_size="base.en",
         ollama_model="llama2",
-        sound_file="sound/blow.aiff"
+        sound_file="sound/blow.aiff",
+        listen_while_answering=True
     ):
-        self.wake_pattern = re.compile(wake_pattern, re.IGNORECASE)
+        self.wake_matcher = WakeMatcher(wake_pattern, wake_prefixes)
         self.sound_file = sound_file
+        self.sound = Sound(sound_file)
         self.ollama_model = ollama_model
+        # True keeps transcribing while Ollama answers; False stops the
+        # microphone stream for the duration of each answer
+        self.listen_while_answering = listen_while_answering
         
         print(f"Loading Whisper model: {model_size}")
-        self.whisper = WhisperModel(model_size, device="cpu", compute_type="int8")
+        self.whisper = get_whisper(model_size, warmup=True)
         
         self.recognizer = sr.Recognizer()
         self.recognizer.pause_threshold = 1.0
         
-        self.audio_queue = Queue()
+        self.audio_queue = DropOldestQueue(maxsize=3)
+        self.phrase_time_limit = 5
+        self._pcm_buffer = np.empty(self.phrase_time_limit * 16000, dtype=np.float32)
         self.is_running = False
         self.is_awake = False
         self.is_processing = False
         
+        # Ollama requests run on their own event loop so the audio pipeline
+        # keeps capturing and transcribing while the model answers
+        self.ollama_client = ollama.AsyncClient()
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        
     def transcribe(self, audio_data):
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+        audio_np = pcm16_to_float32(audio_data, out=self._pcm_buffer)
         segments, _ = self.whisper.transcribe(audio_np, vad_filter=True)
         return " ".join(segment.text.strip() for segment in segments)
     
     def check_wake_word(self, text):
-        return self.wake_pattern.search(text) is not None
+        return self.wake_matcher.matches(text)
     
     def play_sound(self):
         try:
-            data, samplerate = sf.read(self.sound_file)
-            sd.play(data, samplerate)
-            sd.wait()
+            self.sound.play()
         except Exception as e:
             print(f"Sound error: {e}")
     
-    def ask_ollama(self, question):
+    async def _ask_ollama_async(self, question):
         try:
             print(f"\nSending to Ollama: {question}")
+            print("Response: ", end="", flush=True)
             
-            response = ollama.chat(
+            stream = await self.ollama_client.chat(
                 model=self.ollama_model,
-                messages=[{'role': 'user', 'content': question}]
+                messages=[{'role': 'user', 'content': question}],
+                stream=True
             )
             
-            answer = response['message']['content']
-            print(f"Response: {answer}\n")
+            parts = []
+            async for chunk in stream:
+                content = chunk['message']['content']
+                print(content, end="", flush=True)
+                parts.append(content)
+            print("\n")
             
-            return answer
+            return "".join(parts)
         except Exception as e:
-            print(f"Ollama error: {e}")
+            print(f"\nOllama error: {e}")
             return "Error processing request."
     
+    def ask_ollama(self, question):
+        """Schedule a question on the Ollama loop and return its future."""
+        return asyncio.run_coroutine_threadsafe(self._ask_ollama_async(question), self._loop)
+    
+    def _on_answer(self, future):
+        if not self.listen_while_answering and self.is_running:
+            self._resume_capture()
+        self.is_awake = False
+        self.is_processing = False
+        print("Ready for wake word...\n")
+    
+    def _pause_capture(self):
+        """Stop the background listener so no audio is captured at all."""
+        self.stop_listening(wait_for_stop=True)
+    
+    def _resume_capture(self):
+        """Start (or restart) the background listener on the microphone."""
+        self.stop_listening = self.recognizer.listen_in_background(
+            self.mic,
+            self._audio_callback,
+            phrase_time_limit=self.phrase_time_limit
+        )
+    
     def _audio_callback(self, _, audio):
-        if not self.is_processing:
-            self.audio_queue.put(audio.get_raw_data())
+        self.audio_queue.put_latest(audio.get_raw_data())
     
     def start(self):
         self.is_running = True
+        self._loop_thread.start()
         
-        mic = sr.Microphone(sample_rate=16000)
-        with mic as source:
+        self.mic = sr.Microphone(sample_rate=16000)
+        with self.mic as source:
             print("Adjusting for ambient noise...")
             self.recognizer.adjust_for_ambient_noise(source, duration=1)
         
-        self.stop_listening = self.recognizer.listen_in_background(
-            mic,
-            self._audio_callback,
-            phrase_time_limit=5
-        )
+        self._resume_capture()
         
         print("\n" + "="*50)
         print("Voice Assistant Active")
@@ -94,47 +131,55 @@ class VoiceAssistant:
     
     def process_audio(self):
         while self.is_running:
-            if not self.audio_queue.empty() and not self.is_processing:
-                audio_data = self.audio_queue.get()
+            try:
+                audio_data = self.audio_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            
+            if self.is_processing:
+                # Still answering; drop the phrase without transcribing it so
+                # Whisper doesn't compete with the answer or print over it
+                continue
+            
+            try:
+                text = self.transcribe(audio_data)
                 
-                try:
-                    text = self.transcribe(audio_data)
+                if not text.strip():
+                    continue
+                
+                if not self.is_awake:
+                    print(f"[Monitoring] {text}")
+                    
+                    if self.check_wake_word(text):
+                        print("\n✓ Wake word detected!")
+                        print("Listening for command...\n")
+                        self.play_sound()
+                        self.is_awake = True
+                else:
+                    print(f"[Command] {text}")
                     
-                    if not text.strip():
-                        continue
+                    self.is_processing = True
+                    answer = self.ask_ollama(text)
+                    if not self.listen_while_answering:
+                        # Runs alongside the request; the listener may take
+                        # up to a phrase to wind down
+                        self._pause_capture()
+                    answer.add_done_callback(self._on_answer)
                     
-                    if not self.is_awake:
-                        print(f"[Monitoring] {text}")
-                        
-                        if self.check_wake_word(text):
-                            print("\n✓ Wake word detected!")
-                            print("Listening for command...\n")
-                            self.play_sound()
-                            self.is_awake = True
-                    else:
-                        print(f"[Command] {text}")
-                        
-                        self.is_processing = True
-                        response = self.ask_ollama(text)
-                        self.is_processing = False
-                        
-                        self.is_awake = False
-                        print("Ready for wake word...\n")
-                        
-                except Exception as e:
-                    print(f"Error: {e}")
-                    self.is_awake = False
-            else:
-                sleep(0.1)
+            except Exception as e:
+                print(f"Error: {e}")
+                self.is_awake = False
     
     def stop(self):
         self.is_running = False
         if hasattr(self, 'stop_listening'):
             self.stop_listening(wait_for_stop=False)
+        self._loop.call_soon_threadsafe(self._loop.stop)
 
 if __name__ == "__main__":
     assistant = VoiceAssistant(
         wake_pattern=r"\b(hey|hi|hello)\s+(assistant|jarvis)\b",
+        wake_prefixes=("hey ", "hi ", "hello "),
         model_size="base.en",
         ollama_model="qwen2.5:0.5b",
         sound_file="sound/blow.aiff"
@@ -1,14 +1,13 @@
 #!/usr/bin/env python3
-"""Wake word detection using speech_recognition for audio capture."""
+"""Wake word detection reading raw microphone frames with sounddevice."""
 
-import speech_recognition as sr
 import numpy as np
 import sounddevice as sd
-import soundfile as sf
 from openwakeword.model import Model
 import openwakeword
 import time
-from queue import Queue
+import threading
+from audio_utils import RingBuffer, Sound
 
 class OpenWakeWordDetector:
     def __init__(
@@ -20,6 +19,7 @@ class OpenWakeWordDetector:
         sample_rate=16000
     ):
         self.sound_file = sound_file
+        self.sound = Sound(sound_file)
         self.threshold = threshold
         self.cooldown = cooldown
         self.sample_rate = sample_rate
@@ -28,8 +28,11 @@ class OpenWakeWordDetector:
         self.last_detection = 0
         self.is_running = False
         
-        # Queue for audio chunks
-        self.audio_queue = Queue()
+        # Microphone samples land in a ring holding ~2 s; the detection
+        # loop reads them back one 1280-sample frame at a time
+        self.ring = RingBuffer(self.sample_rate * 2)
+        self._frame = np.zeros(self.chunk_size, dtype=np.int16)
+        self._data_ready = threading.Event()
         
         # Download preprocessing models
         print("Downloading required preprocessing models...")
@@ -44,77 +47,61 @@ class OpenWakeWordDetector:
         print(f"Detection threshold: {self.threshold}")
         print(f"Cooldown period: {self.cooldown}s")
         
-        # Initialize speech recognizer
-        self.recognizer = sr.Recognizer()
-        
     def play_sound(self):
         try:
-            data, samplerate = sf.read(self.sound_file)
-            sd.play(data, samplerate)
-            sd.wait()
+            self.sound.play()
         except Exception as e:
             print(f"Could not play sound: {e}")
     
-    def audio_callback(self, recognizer, audio):
-        """Callback for background audio listener."""
-        self.audio_queue.put(audio.get_raw_data())
+    def audio_callback(self, indata, frames, time_info, status):
+        """Callback for the PortAudio input stream."""
+        self.ring.write(np.frombuffer(indata, dtype=np.int16))
+        self._data_ready.set()
     
     def start(self):
         self.is_running = True
         
-        # Initialize microphone
-        mic = sr.Microphone(sample_rate=self.sample_rate)
-        
-        with mic as source:
-            print("\nAdjusting for ambient noise...")
-            self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        # Open the microphone; PortAudio delivers one 80 ms block per callback
+        stream = sd.RawInputStream(
+            samplerate=self.sample_rate,
+            blocksize=self.chunk_size,
+            dtype='int16',
+            channels=1,
+            callback=self.audio_callback
+        )
         
         print("\n" + "="*50)
         print("Listening for wake word...")
         print("="*50 + "\n")
         
-        # Start background listener
-        self.stop_listening = self.recognizer.listen_in_background(
-            mic,
-            self.audio_callback,
-            phrase_time_limit=2  # Capture audio every 2 seconds
-        )
+        stream.start()
         
         try:
             while self.is_running:
-                if not self.audio_queue.empty():
-                    audio_data = self.audio_queue.get()
-                    
-                    # Convert to numpy array
-                    audio_np = np.frombuffer(audio_data, dtype=np.int16)
-                    
-                    # Process in chunks of 1280 samples (openwakeword requirement)
-                    for i in range(0, len(audio_np), self.chunk_size):
-                        chunk = audio_np[i:i + self.chunk_size]
-                        
-                        # Pad if chunk is too small
-                        if len(chunk) < self.chunk_size:
-                            chunk = np.pad(chunk, (0, self.chunk_size - len(chunk)))
-                        
-                        # Predict
-                        prediction = self.model.predict(chunk)
-                        
-                        for wake_word, score in prediction.items():
-                            current_time = time.time()
-                            
-                            if score >= self.threshold:
-                                if current_time - self.last_detection >= self.cooldown:
-                                    print(f"✓ Wake word detected! (confidence: {score:.2f})")
-                                    self.play_sound()
-                                    self.last_detection = current_time
-                                    print(f"Cooldown active for {self.cooldown}s...\n")
-                else:
-                    time.sleep(0.05)
+                # Read one 1280-sample frame (openwakeword requirement)
+                chunk = self.ring.read(self.chunk_size, self._frame)
+                if chunk is None:
+                    self._data_ready.wait(timeout=0.2)
+                    self._data_ready.clear()
+                    continue
+                
+                prediction = self.model.predict(chunk)
+                
+                score = prediction[self.wake_word_name]
+                
+                if score >= self.threshold:
+                    current_time = time.time()
+                    if current_time - self.last_detection >= self.cooldown:
+                        print(f"✓ Wake word detected! (confidence: {score:.2f})")
+                        self.play_sound()
+                        self.last_detection = current_time
+                        print(f"Cooldown active for {self.cooldown}s...\n")
                     
         except KeyboardInterrupt:
             print("\nStopping...")
         finally:
-            self.stop_listening(wait_for_stop=False)
+            stream.stop()
+            stream.close()
     
     def stop(self):
         self.is_running = False
@@ -3,49 +3,49 @@
 
 import speech_recognition as sr
 import numpy as np
-import re
-import sounddevice as sd
-import soundfile as sf
-from queue import Queue
-from time import sleep
-from faster_whisper import WhisperModel
+from queue import Empty
+from whisper_pool import get_whisper
+from audio_utils import pcm16_to_float32, DropOldestQueue, Sound
+from wake_text import WakeMatcher
 
 class WakeWordDetector:
     def __init__(
         self, 
         wake_pattern=r"\b(hey|hi|hello)\s+(jabra|assistant)\b",
+        wake_prefixes=None,
         model_size="base.en",
         sound_file="sound/blow.aiff"
     ):
-        self.wake_pattern = re.compile(wake_pattern, re.IGNORECASE)
+        self.wake_matcher = WakeMatcher(wake_pattern, wake_prefixes)
         self.sound_file = sound_file
+        self.sound = Sound(sound_file)
         
         print(f"Loading Whisper model: {model_size}")
-        self.model = WhisperModel(model_size, device="cpu", compute_type="int8")
+        self.model = get_whisper(model_size, warmup=True)
         
         self.recognizer = sr.Recognizer()
         self.recognizer.pause_threshold = 1.0
-        self.audio_queue = Queue()
+        self.audio_queue = DropOldestQueue(maxsize=3)
+        self.phrase_time_limit = 3
+        self._pcm_buffer = np.empty(self.phrase_time_limit * 16000, dtype=np.float32)
         self.is_running = False
         
     def transcribe(self, audio_data):
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+        audio_np = pcm16_to_float32(audio_data, out=self._pcm_buffer)
         segments, _ = self.model.transcribe(audio_np, vad_filter=True)
         return " ".join(segment.text.strip() for segment in segments)
     
     def check_wake_word(self, text):
-        return self.wake_pattern.search(text) is not None
+        return self.wake_matcher.matches(text)
     
     def play_sound(self):
         try:
-            data, samplerate = sf.read(self.sound_file)
-            sd.play(data, samplerate)
-            sd.wait()
+            self.sound.play()
         except Exception as e:
             print(f"Could not play sound: {e}")
     
     def _audio_callback(self, _, audio):
-        self.audio_queue.put(audio.get_raw_data())
+        self.audio_queue.put_latest(audio.get_raw_data())
     
     def start(self):
         self.is_running = True
@@ -58,7 +58,7 @@ class WakeWordDetector:
         self.stop_listening = self.recognizer.listen_in_background(
             mic, 
             self._audio_callback,
-            phrase_time_limit=3
+            phrase_time_limit=self.phrase_time_limit
         )
         
         print("\nListening for wake word...")
@@ -66,23 +66,23 @@ class WakeWordDetector:
     
     def process_audio(self):
         while self.is_running:
-            if not self.audio_queue.empty():
-                audio_data = self.audio_queue.get()
+            try:
+                audio_data = self.audio_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            
+            try:
+                text = self.transcribe(audio_data)
                 
-                try:
-                    text = self.transcribe(audio_data)
+                if text.strip():
+                    print(f"Heard: {text}")
                     
-                    if text.strip():
-                        print(f"Heard: {text}")
+                    if self.check_wake_word(text):
+                        print("\n✓ Wake word detected!\n")
+                        self.play_sound()
                         
-                        if self.check_wake_word(text):
-                            print("\n✓ Wake word detected!\n")
-                            self.play_sound()
-                            
-                except Exception as e:
-                    print(f"Error: {e}")
-            else:
-                sleep(0.1)
+            except Exception as e:
+                print(f"Error: {e}")
     
     def stop(self):
         self.is_running = False
@@ -92,6 +92,7 @@ class WakeWordDetector:
 if __name__ == "__main__":
     detector = WakeWordDetector(
         wake_pattern=r"\b(hey|hi|hello)\s+(jabra|assistant)\b",
+        wake_prefixes=("hey ", "hi ", "hello "),
         model_size="base.en",
         sound_file="sound/blow.aiff"
     )
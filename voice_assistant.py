@@ -8,15 +8,14 @@ Combined Voice Assistant:
 
 import speech_recognition as sr
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
 from openwakeword.model import Model
-from faster_whisper import WhisperModel
+from whisper_pool import get_whisper
+from audio_utils import pcm16_to_float32, DropOldestQueue, FrameAligner, Sound
 import openwakeword
 import ollama
 import time
 import threading
-from queue import Queue
+from queue import Empty
 
 class VoiceAssistant:
     def __init__(
@@ -29,17 +28,24 @@ class VoiceAssistant:
         cooldown=2.0
     ):
         self.sound_file = sound_file
+        self.sound = Sound(sound_file)
         self.wake_threshold = wake_threshold
         self.cooldown = cooldown
         self.ollama_model = ollama_model
         
+        self.chunk_size = 1280  # openwakeword requirement
         self.last_detection = 0
+        self.phrase_time_limit = 5
+        self._pcm_buffer = np.empty(self.phrase_time_limit * 16000, dtype=np.float32)
         self.is_running = False
         self.is_awake = False
         
+        # Frames the stream for openwakeword, carrying partial frames over
+        self.framer = FrameAligner(self.chunk_size)
+        
         # Queues
-        self.wake_queue = Queue()
-        self.transcription_queue = Queue()
+        self.wake_queue = DropOldestQueue(maxsize=3, name="Wake Word")
+        self.transcription_queue = DropOldestQueue(maxsize=3, name="Transcription")
         
         # Initialize wake word model
         print("Downloading required preprocessing models...")
@@ -51,7 +57,7 @@ class VoiceAssistant:
         
         # Initialize Whisper model
         print(f"Loading Whisper model: {whisper_model}")
-        self.whisper = WhisperModel(whisper_model, device="cpu", compute_type="int8")
+        self.whisper = get_whisper(whisper_model, warmup=True)
         
         # Initialize speech recognizer
         self.recognizer = sr.Recognizer()
@@ -64,15 +70,13 @@ class VoiceAssistant:
     def play_sound(self):
         """Play notification sound."""
         try:
-            data, samplerate = sf.read(self.sound_file)
-            sd.play(data, samplerate)
-            sd.wait()
+            self.sound.play()
         except Exception as e:
             print(f"Sound error: {e}")
     
     def transcribe_audio(self, audio_data):
         """Transcribe audio using faster_whisper."""
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+        audio_np = pcm16_to_float32(audio_data, out=self._pcm_buffer)
         segments, _ = self.whisper.transcribe(audio_np, vad_filter=True)
         return " ".join(segment.text.strip() for segment in segments)
     
@@ -102,34 +106,25 @@ class VoiceAssistant:
         print("[Wake Word] Detection active\n")
         
         while self.is_running:
-            if not self.wake_queue.empty():
-                audio_data = self.wake_queue.get()
+            try:
+                audio_data = self.wake_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            
+            # Process in chunks of 1280 samples (openwakeword requirement)
+            for chunk, _ in self.framer.frames(audio_data):
+                prediction = self.wake_model.predict(chunk)
                 
-                # Convert to numpy array for openwakeword
-                audio_np = np.frombuffer(audio_data, dtype=np.int16)
+                score = prediction[self.wake_word_name]
                 
-                # Process in chunks of 1280 samples (openwakeword requirement)
-                chunk_size = 1280
-                for i in range(0, len(audio_np), chunk_size):
-                    chunk = audio_np[i:i + chunk_size]
-                    if len(chunk) < chunk_size:
-                        chunk = np.pad(chunk, (0, chunk_size - len(chunk)))
-                    
-                    prediction = self.wake_model.predict(chunk)
-                    
-                    for wake_word, score in prediction.items():
-                        current_time = time.time()
-                        
-                        if score >= self.wake_threshold:
-                            if current_time - self.last_detection >= self.cooldown:
-                                print(f"\n✓ Wake word detected! (confidence: {score:.2f})")
-                                print("🎤 Listening for your command...\n")
-                                self.play_sound()
-                                self.is_awake = True
-                                self.last_detection = current_time
-                                break
-            else:
-                time.sleep(0.05)
+                if score >= self.wake_threshold:
+                    current_time = time.time()
+                    if current_time - self.last_detection >= self.cooldown:
+                        print(f"\n✓ Wake word detected! (confidence: {score:.2f})")
+                        print("🎤 Listening for your command...\n")
+                        self.play_sound()
+                        self.is_awake = True
+                        self.last_detection = current_time
         
         print("[Wake Word] Detection stopped")
     
@@ -138,31 +133,31 @@ class VoiceAssistant:
         print("[Transcription] Worker active\n")
         
         while self.is_running:
-            if not self.transcription_queue.empty():
-                audio_data = self.transcription_queue.get()
+            try:
+                audio_data = self.transcription_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            
+            try:
+                text = self.transcribe_audio(audio_data)
                 
-                try:
-                    text = self.transcribe_audio(audio_data)
-                    
-                    if text.strip():
-                        if self.is_awake:
-                            # Command received after wake word
-                            print(f"💬 [Command] {text}\n")
-                            
-                            # Send to Ollama for processing
-                            self.ask_ollama(text)
-                            
-                            self.is_awake = False
-                            print("👂 Ready for wake word...\n")
-                        else:
-                            # Regular transcription (monitoring)
-                            print(f"📝 [Monitoring] {text}")
-                            
-                except Exception as e:
-                    print(f"[Transcription] Error: {e}")
-                    self.is_awake = False
-            else:
-                time.sleep(0.05)
+                if text.strip():
+                    if self.is_awake:
+                        # Command received after wake word
+                        print(f"💬 [Command] {text}\n")
+                        
+                        # Send to Ollama for processing
+                        self.ask_ollama(text)
+                        
+                        self.is_awake = False
+                        print("👂 Ready for wake word...\n")
+                    else:
+                        # Regular transcription (monitoring)
+                        print(f"📝 [Monitoring] {text}")
+                        
+            except Exception as e:
+                print(f"[Transcription] Error: {e}")
+                self.is_awake = False
         
         print("[Transcription] Worker stopped")
     
@@ -171,10 +166,10 @@ class VoiceAssistant:
         audio_data = audio.get_raw_data()
         
         # Send to wake word detection (always)
-        self.wake_queue.put(audio_data)
+        self.wake_queue.put_latest(audio_data)
         
         # Send to transcription queue
-        self.transcription_queue.put(audio_data)
+        self.transcription_queue.put_latest(audio_data)
     
     def start(self):
         """Start the voice assistant."""
@@ -207,7 +202,7 @@ class VoiceAssistant:
         self.stop_listening = self.recognizer.listen_in_background(
             mic,
             self.audio_callback,
-            phrase_time_limit=5
+            phrase_time_limit=self.phrase_time_limit
         )
         
         try:
@@ -0,0 +1,23 @@
+"""Wake phrase matching on transcribed text."""
+
+import re
+
+class WakeMatcher:
+    """Regex wake phrase match with an optional substring prefilter.
+
+    ``prefixes`` are lowercase substrings every match of ``pattern``
+    contains, e.g. ``("hey ", "hi ", "hello ")`` for
+    ``r"\\b(hey|hi|hello)\\s+assistant\\b"``. Checking them first skips the
+    regex for most transcripts. They can't be derived from an arbitrary
+    pattern, so the prefilter only runs when the caller passes them.
+    """
+    def __init__(self, pattern, prefixes=None):
+        self.pattern = re.compile(pattern, re.IGNORECASE)
+        self.prefixes = tuple(prefixes) if prefixes else None
+    
+    def matches(self, text):
+        if self.prefixes:
+            low = text.lower()
+            if not any(prefix in low for prefix in self.prefixes):
+                return False
+        return self.pattern.search(text) is not None
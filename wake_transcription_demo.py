@@ -8,14 +8,13 @@ Wake word + transcription using:
 
 import speech_recognition as sr
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
 from openwakeword.model import Model
-from faster_whisper import WhisperModel
+from whisper_pool import get_whisper
+from audio_utils import pcm16_to_float32, DropOldestQueue, FrameAligner, Sound
 import openwakeword
 import time
 import threading
-from queue import Queue
+from queue import Empty
 
 class VoiceAssistant:
     def __init__(
@@ -27,16 +26,23 @@ class VoiceAssistant:
         cooldown=2.0
     ):
         self.sound_file = sound_file
+        self.sound = Sound(sound_file)
         self.wake_threshold = wake_threshold
         self.cooldown = cooldown
         
+        self.chunk_size = 1280  # openwakeword requirement
         self.last_detection = 0
+        self.phrase_time_limit = 5
+        self._pcm_buffer = np.empty(self.phrase_time_limit * 16000, dtype=np.float32)
         self.is_running = False
         self.is_awake = False
         
+        # Frames the stream for openwakeword, carrying partial frames over
+        self.framer = FrameAligner(self.chunk_size)
+        
         # Queues
-        self.wake_queue = Queue()
-        self.transcription_queue = Queue()
+        self.wake_queue = DropOldestQueue(maxsize=3, name="Wake Word")
+        self.transcription_queue = DropOldestQueue(maxsize=3, name="Transcription")
         
         # Initialize wake word model
         print("Downloading required preprocessing models...")
@@ -48,104 +54,154 @@ class VoiceAssistant:
         
         # Initialize Whisper model
         print(f"Loading Whisper model: {whisper_model}")
-        self.whisper = WhisperModel(whisper_model, device="cpu", compute_type="int8")
+        self.whisper = get_whisper(whisper_model, warmup=True)
         
         # Initialize speech recognizer
         self.recognizer = sr.Recognizer()
         self.recognizer.pause_threshold = 1.0
         
+        # Audio after the wake word in the same phrase is transcribed on its
+        # own if it is longer than the silence that ends every phrase.
+        # Otherwise the next phrase is the command; it is awaited for up to
+        # command_timeout seconds, which covers a full phrase plus the pause.
+        self.min_preroll = self.recognizer.non_speaking_duration + 0.5
+        self.command_timeout = 2 * self.phrase_time_limit + 5.0
+        # None, "preroll" (pre-roll being transcribed) or "waiting" (for the
+        # next phrase until _command_deadline)
+        self._command_state = None
+        self._command_deadline = 0.0
+        
         print(f"\nWake word: {self.wake_word_name}")
         print("Ready!\n")
         
     def play_sound(self):
         try:
-            data, samplerate = sf.read(self.sound_file)
-            sd.play(data, samplerate)
-            sd.wait()
+            self.sound.play()
         except Exception as e:
             print(f"Sound error: {e}")
     
     def transcribe_audio(self, audio_data):
         """Transcribe audio using faster_whisper."""
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+        audio_np = pcm16_to_float32(audio_data, out=self._pcm_buffer)
         segments, _ = self.whisper.transcribe(audio_np, vad_filter=True)
         return " ".join(segment.text.strip() for segment in segments)
     
     def wake_word_worker(self):
-        """Worker thread for wake word detection."""
+        """Worker thread for wake word detection.
+        
+        Whisper only runs on audio that follows a detection. If the rest of
+        the phrase the wake word was heard in is long enough to hold a
+        command it is transcribed straight away; if that turns out to be
+        silence, or it was too short, the next phrase is the command.
+        """
         print("[Wake Word] Detection active\n")
         
+        preroll = b""
+        held = None
+        min_preroll_bytes = int(self.min_preroll * 16000) * 2
+        
         while self.is_running:
-            if not self.wake_queue.empty():
-                audio_data = self.wake_queue.get()
+            if self._command_state == "waiting":
+                if held is not None:
+                    # Phrase that arrived while the pre-roll was transcribed
+                    self._command_state = None
+                    self.transcription_queue.put_latest((preroll + held, False))
+                    preroll, held = b"", None
+                elif time.monotonic() > self._command_deadline:
+                    print("No command heard.")
+                    print("Ready for wake word...\n")
+                    self._command_state = None
+                    preroll = b""
+                    self.is_awake = False
+            elif self._command_state is None:
+                held = None
+            
+            try:
+                audio_data = self.wake_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            
+            if self._command_state == "waiting":
+                # Phrase following the wake word is the command
+                self._command_state = None
+                self.transcription_queue.put_latest((preroll + audio_data, False))
+                preroll = b""
+            elif self._command_state == "preroll":
+                # Keep it until the pre-roll is known to be silence or a command
+                held = audio_data
+            
+            detected = False
+            
+            # Process in chunks of 1280 samples (openwakeword requirement)
+            for chunk, end in self.framer.frames(audio_data):
+                prediction = self.wake_model.predict(chunk)
                 
-                # Convert to numpy array for openwakeword
-                audio_np = np.frombuffer(audio_data, dtype=np.int16)
+                score = prediction[self.wake_word_name]
                 
-                # Process in chunks of 1280 samples (openwakeword requirement)
-                chunk_size = 1280
-                for i in range(0, len(audio_np), chunk_size):
-                    chunk = audio_np[i:i + chunk_size]
-                    if len(chunk) < chunk_size:
-                        chunk = np.pad(chunk, (0, chunk_size - len(chunk)))
-                    
-                    prediction = self.wake_model.predict(chunk)
-                    
-                    for wake_word, score in prediction.items():
-                        current_time = time.time()
-                        
-                        if score >= self.wake_threshold:
-                            if current_time - self.last_detection >= self.cooldown:
-                                print(f"\n✓ Wake word detected! (confidence: {score:.2f})")
-                                print("Listening for command...\n")
-                                self.play_sound()
-                                self.is_awake = True
-                                self.last_detection = current_time
-                                break
-            else:
-                time.sleep(0.05)
+                if score >= self.wake_threshold:
+                    current_time = time.time()
+                    if current_time - self.last_detection >= self.cooldown:
+                        print(f"\n✓ Wake word detected! (confidence: {score:.2f})")
+                        print("Listening for command...\n")
+                        self.play_sound()
+                        self.is_awake = True
+                        self.last_detection = current_time
+                        detected = True
+                        # Keep whatever was said after the wake word
+                        preroll = audio_data[end * 2:]
+            
+            if detected:
+                held = None
+                if len(preroll) >= min_preroll_bytes:
+                    # Wake word and command may have been said in one breath
+                    self._command_state = "preroll"
+                    self.transcription_queue.put_latest((preroll, True))
+                    preroll = b""
+                else:
+                    self._command_deadline = time.monotonic() + self.command_timeout
+                    self._command_state = "waiting"
         
         print("[Wake Word] Detection stopped")
     
     def transcription_worker(self):
-        """Worker thread for transcription."""
+        """Worker thread for transcribing commands after the wake word."""
         print("[Transcription] Worker active\n")
         
         while self.is_running:
-            if not self.transcription_queue.empty():
-                audio_data = self.transcription_queue.get()
+            try:
+                audio_data, is_preroll = self.transcription_queue.get(timeout=0.2)
+            except Empty:
+                continue
+            
+            text = ""
+            try:
+                text = self.transcribe_audio(audio_data).strip()
+            except Exception as e:
+                print(f"[Transcription] Error: {e}")
+            
+            if is_preroll:
+                if not text:
+                    # Only silence followed the wake word; wait for the next phrase
+                    self._command_deadline = time.monotonic() + self.command_timeout
+                    self._command_state = "waiting"
+                    continue
+                self._command_state = None
+            
+            if text:
+                print(f"[Command] {text}\n")
                 
-                try:
-                    text = self.transcribe_audio(audio_data)
-                    
-                    if text.strip():
-                        if self.is_awake:
-                            print(f"[Command] {text}\n")
-                            
-                            # Process command here
-                            # e.g., send to Ollama, execute action, etc.
-                            
-                            self.is_awake = False
-                            print("Ready for wake word...\n")
-                        else:
-                            print(f"[Monitoring] {text}")
-                            
-                except Exception as e:
-                    print(f"[Transcription] Error: {e}")
-            else:
-                time.sleep(0.05)
+                # Process command here
+                # e.g., send to Ollama, execute action, etc.
+            
+            self.is_awake = False
+            print("Ready for wake word...\n")
         
         print("[Transcription] Worker stopped")
     
     def audio_callback(self, recognizer, audio):
         """Callback from speech_recognition background listener."""
-        audio_data = audio.get_raw_data()
-        
-        # Send to wake word detection (always)
-        self.wake_queue.put(audio_data)
-        
-        # Send to transcription queue
-        self.transcription_queue.put(audio_data)
+        # Wake word detection sees everything; it forwards commands to Whisper
+        self.wake_queue.put_latest(audio.get_raw_data())
     
     def start(self):
         self.is_running = True
@@ -169,13 +225,13 @@ class VoiceAssistant:
         print("VOICE ASSISTANT ACTIVE")
         print("="*60)
         print("Wake word detection: Active")
-        print("Continuous transcription: Active")
+        print("Command transcription: After wake word")
         print("="*60 + "\n")
         
         self.stop_listening = self.recognizer.listen_in_background(
             mic,
             self.audio_callback,
-            phrase_time_limit=5
+            phrase_time_limit=self.phrase_time_limit
         )
         
         try:
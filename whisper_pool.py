@@ -0,0 +1,68 @@
+"""Construct and share faster-whisper models with hardware-appropriate settings."""
+
+import os
+from functools import lru_cache
+
+import ctranslate2
+import numpy as np
+from faster_whisper import WhisperModel
+
+def build_whisper(model_size, device="auto", compute_type=None, cpu_threads=None, num_workers=1):
+    """Load a WhisperModel, picking the device and quantization automatically.
+
+    With ``device="auto"`` CUDA is used when available. The weights run as
+    ``int8_float16`` on GPUs with fast FP16, falling back to
+    ``int8_float32`` or ``int8`` on ones without; on CPU they stay ``int8``.
+    Half of the logical cores are given to intra-op threads by default.
+
+    Kernel selection happens on the first call; see ``warmup_whisper``.
+    """
+    if device == "auto":
+        device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    if compute_type is None:
+        preferred = ("int8_float16", "int8_float32", "int8") if device == "cuda" else ("int8",)
+        supported = ctranslate2.get_supported_compute_types(device)
+        compute_type = next((t for t in preferred if t in supported), "default")
+    if cpu_threads is None:
+        cpu_threads = max(1, (os.cpu_count() or 2) // 2)
+    
+    return WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers
+    )
+
+def warmup_whisper(model, sample_rate=16000):
+    """Run one second of silence through the model and its VAD.
+
+    The mel filterbank is built with the model, but the Silero VAD session
+    and CTranslate2 kernel selection are set up lazily on first use. Doing
+    that here keeps it off the first real utterance.
+    """
+    silence = np.zeros(sample_rate, dtype=np.float32)
+    for vad_filter in (True, False):
+        segments, _ = model.transcribe(silence, vad_filter=vad_filter)
+        for _ in segments:
+            pass
+
+@lru_cache(maxsize=4)
+def _cached_whisper(model_size, device, compute_type):
+    return build_whisper(model_size, device=device, compute_type=compute_type)
+
+_warmed = set()
+
+def get_whisper(model_size, device="auto", compute_type=None, warmup=False):
+    """Return a process-wide WhisperModel for these settings.
+
+    Every caller asking for the same model shares one set of weights and
+    one CTranslate2 context instead of loading its own copy. Long-running
+    callers pass ``warmup=True`` to pay first-use setup at load time; the
+    model is warmed at most once however often it is requested.
+    """
+    model = _cached_whisper(model_size, device, compute_type)
+    if warmup and model not in _warmed:
+        warmup_whisper(model)
+        _warmed.add(model)
+    return model
@@ -3,11 +3,10 @@
 
 import speech_recognition as sr
 import wave
-import numpy as np
-from queue import Queue
-from datetime import datetime
-from time import sleep
-from faster_whisper import WhisperModel
+from queue import Queue, Empty
+import time
+from whisper_pool import get_whisper
+from audio_utils import pcm16_to_float32
 
 class AudioRecorder:
     def __init__(self, sample_rate=16000):
@@ -35,28 +34,30 @@ class AudioRecorder:
             phrase_time_limit=chunk_size
         )
         
-        all_audio = b''
-        start_time = datetime.now()
-        expected_bytes = self.sample_rate * 2 * duration_seconds
+        # Single growable buffer shared by save_wav and transcribe
+        audio = bytearray()
+        bytes_per_sec = self.sample_rate * 2
+        expected_bytes = bytes_per_sec * duration_seconds
+        start = time.monotonic()
         
         try:
             while True:
-                elapsed = (datetime.now() - start_time).total_seconds()
+                try:
+                    data = self.audio_queue.get(timeout=0.2)
+                    audio += data
+                except Empty:
+                    pass
                 
-                while not self.audio_queue.empty():
-                    all_audio += self.audio_queue.get()
-                
-                if len(all_audio) >= expected_bytes:
+                if len(audio) >= expected_bytes:
                     break
                 
+                elapsed = time.monotonic() - start
                 if elapsed > duration_seconds + 3:
                     break
-                    
-                sleep(0.05)
         finally:
             stop_listening(wait_for_stop=False)
         
-        return all_audio
+        return audio
     
     def save_wav(self, audio_data, filename):
         with wave.open(filename, 'wb') as wf:
@@ -68,14 +69,10 @@ class AudioRecorder:
 class Transcriber:
     def __init__(self, model_size="base.en"):
         print(f"Loading Whisper model: {model_size}")
-        self.model = WhisperModel(
-            model_size,
-            device="cpu",
-            compute_type="int8"
-        )
+        self.model = get_whisper(model_size)
     
     def transcribe(self, audio_data):
-        audio_np = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
+        audio_np = pcm16_to_float32(audio_data)
         segments, info = self.model.transcribe(audio_np, vad_filter=True)
         
         text = " ".join(segment.text.strip() for segment in segments)